@@ -1,15 +1,30 @@
-import json
 import os
+import re
+import shelve
+import sys
+import bisect
+import codecs
+import hashlib
+import math
 import logging
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+import orjson
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_cohere import ChatCohere
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.tools import Tool
-from prompts import EXTRACTION_PROMPT, RECOMMENDATION_PROMPT, FOLLOWUP_WITH_WEB_PROMPT, CARD_SELECTION_PROMPT, FOLLOWUP_FALLBACK_PROMPT, CONVERSATIONAL_GREETING_PROMPT, CONVERSATIONAL_FOLLOWUP_PROMPT, PREFERENCE_EXTRACTION_PROMPT
+
+# LangChain (with the prompt templates built on it), requests and lxml are imported
+# where first used so that startup (and the preference questionnaire) does not wait on them
+if TYPE_CHECKING:
+    import requests
+    from types import ModuleType
+    from langchain_core.prompts import BasePromptTemplate
+    from langchain.tools import Tool
+    from langchain_cohere import ChatCohere, CohereEmbeddings
 
 logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -18,49 +33,474 @@ warnings.filterwarnings('ignore', category=DeprecationWarning)
 
 load_dotenv()
 
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Page elements that never carry useful card information
+_DROP_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside')
+
+# Card record fields used anywhere in the chatbot; the rest are dropped at load time
+CARD_FIELDS = (
+    'name', 'Institution', 'badge', 'fee_breakdown', 'rewards', 'eligibility_income_min',
+    'links', 'interest_rate', 'is_bank_customer_only', 'minimum_credit_score', 'docs_required', 'credit_limit_max'
+)
+
+# Catalogs larger than this are streamed record by record rather than parsed whole
+CATALOG_STREAM_THRESHOLD = 8 * 1024 * 1024  # bytes
+
+# Pages fetched in parallel at most
+FETCH_WORKERS = 8
+
+# Initial HTML bytes read per character of text wanted from a page
+HTML_BYTES_PER_TEXT_CHAR = 6
+
+# In-memory cache of extracted page text
+PAGE_CACHE_SIZE = 256
+PAGE_CACHE_TTL = 900  # seconds
+
+# On-disk cache of extracted page text and recommendation responses, shared across sessions
+WEB_CACHE_TTL = 3600  # seconds
+
+# Recommendation responses reused across sessions for equivalent preference profiles
+RECOMMENDATION_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+# Follow-up answers reused when the same question is asked about the same card
+RESPONSE_CACHE_SIZE = 500
+
+# Rephrased follow-ups answered from cache when their embeddings are this close
+SEMANTIC_CACHE_SIZE = 200
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+# Conversation entries kept; prompts only ever use the most recent few
+CONVERSATION_HISTORY_SIZE = 20
+
+# Queued follow-up questions are answered together once this many are waiting
+QUESTION_BATCH_SIZE = 3
+
+# Fee detail wording that marks a fee as waived
+WAIVE_WORDS = ('nil', 'waived')
+
+# Card fields sent to the LLM when answering follow-up questions
+COMPACT_CARD_FIELDS = (
+    'name', 'Institution', 'fee_breakdown', 'rewards', 'eligibility_income_min', 'badge', 'interest_rate',
+    'is_bank_customer_only', 'minimum_credit_score', 'docs_required', 'credit_limit_max'
+)
+
+# Card feature bits, computed once per card at load time
+FEATURE_LOUNGE = 1 << 0
+FEATURE_FUEL = 1 << 1
+FEATURE_CASHBACK = 1 << 2
+FEATURE_TRAVEL = 1 << 3
+FEATURE_MOVIES = 1 << 4
+FEATURE_DINING = 1 << 5
+FEATURE_RAILWAY = 1 << 6
+FEATURE_WELCOME = 1 << 7
+FEATURE_MILESTONE = 1 << 8
+FEATURE_INSURANCE = 1 << 9
+FEATURE_JOINING_FEE_LOW = 1 << 10
+FEATURE_ANNUAL_FEE_LOW = 1 << 11
+
+# Every keyword the feature bits depend on, matched in one scan of the rewards text.
+# 'milestone' precedes 'miles' so both features see a milestone reward.
+_KEYWORD_RE = re.compile(
+    r'lounge|fuel|cashback|travel|milestone|miles|points|air|movie|pvr|dining|restaurant|railway|irctc|welcome|insurance|cover'
+)
+
+# Follow-up wording that asks for current information from the card's links
+_WEB_KW_RE = re.compile(r'latest|current|offers|application|apply|website|official|bank', re.IGNORECASE)
+
+# Commands the conversational LLM can embed in its reply
+_CMD_RE = re.compile(r'(SWITCH_TO|FETCH_LINK):[ \t]*([^\n]+)')
+
+# Follow-up triage: comparisons, recommendations, searches for other cards and
+# open-ended reasoning need the main model
+_COMPLEX_RE = re.compile(
+    r'\b(compare|comparison|versus|vs|better|best|worth|should|alternatives?|instead|other|switch|recommend|similar|difference|why'
+    r'|lower|lowest|cheaper|cheapest|higher|highest|different|another|show|find|suggest|options?)\b'
+    r'|\b(a|an|any|which|some)\s+(\w+\s+)?cards?\b|\bcards\b|\bno\s+(annual\s+|joining\s+)?(fees?|charges?)\b',
+    re.IGNORECASE
+)
+
+# Short questions asking for one of these card facts are answered straight from the card data
+_EXTRACTIVE_RES = (
+    ('fees', re.compile(r'\b(fees?|charges?|cost)\b', re.IGNORECASE)),
+    ('eligibility', re.compile(r'\beligib|\b(income|salary|qualify|credit score)\b', re.IGNORECASE)),
+    ('issuer', re.compile(r'\b(which|what) bank\b|\bissue[rd]\b|\bbank account\b', re.IGNORECASE)),
+    ('interest', re.compile(r'\binterest\b(?![- ]free)|\bapr\b', re.IGNORECASE)),
+)
+
+# Topics joined in one question; each part must ask for a card fact to be answered from the data
+_JOINED_PARTS_RE = re.compile(r'\band\b|&|,', re.IGNORECASE)
+
+# Words in fee type names that do not identify a particular fee
+_GENERIC_FEE_WORDS = frozenset({'fee', 'fees', 'charge', 'charges', 'card', 'a', 'at', 'for', 'on', 'or', 'up'})
+
+# Every word a question answered straight from the card data may use, besides the card's own
+# name and fee type words; anything else (e.g. "waived", "lounge", another card) needs a model
+_EXTRACTIVE_WORDS = frozenset({
+    'what', 'whats', 's', 'is', 'are', 'the', 'a', 'an', 'of', 'on', 'for', 'this', 'it', 'its', 'my',
+    'card', 'credit', 'tell', 'me', 'about', 'how', 'much', 'does', 'please', 'and',
+    'fee', 'fees', 'charge', 'charges', 'cost', 'eligibility', 'eligible', 'criteria', 'income', 'salary',
+    'minimum', 'min', 'required', 'requirement', 'qualify', 'score', 'which', 'bank', 'issuer', 'issued',
+    'issues', 'account', 'interest', 'rate', 'apr'
+})
+
+# Product-tier and marketing words in card names that also describe cards in general,
+# so a question using them ("is it lifetime free?") is not about another card
+_GENERIC_NAME_WORDS = frozenset({
+    'rewards', 'cashback', 'free', 'lifetime', 'premium', 'gold', 'platinum', 'plus', 'select', 'business',
+    'cards', 'signature', 'visa', 'metal', 'variant', 'co', 'branded', 'contactless', 'chip', 'super', 'saver',
+    'infinite', 'private', 'privilege', 'club', 'mine', 'different', 'dream', 'delight', 'explorer', 'pvr'
+})
+
+# Card names sharing a word beyond this many leave it too common to identify a card
+DISTINCTIVE_NAME_CARDS = 2
+
+# Questions about the user's own situation ("am I eligible?") are left to the model
+_PERSONAL_RE = re.compile(r'\b(am|can|will|do|does|would) (i|my)\b', re.IGNORECASE)
+
+# Word counts bounding the triage tiers
+EXTRACTIVE_QUESTION_WORDS = 12
+LONG_QUESTION_WORDS = 30
+
+# Only self-contained questions are answered from cache: they open like a question about
+# the card and are long enough to carry their own subject ("yes" or "the second one" are not)
+_STANDALONE_RE = re.compile(r"^\W*(what|what's|whats|how|does|do|is|are|can|tell me|explain|list)\b", re.IGNORECASE)
+STANDALONE_QUESTION_WORDS = 4
+
+# Wording that leans on the previous turn even in an otherwise self-contained question
+_CONTEXTUAL_RE = re.compile(
+    r'^\W*(why|and|so|what about|how about|how come)\b'
+    r'|\b(that|those|them|more|else|above|previous|earlier|one|ones|first|second|third|last|former|latter)\b',
+    re.IGNORECASE
+)
+
+# Command keywords hidden from streamed output; they are carried out once the reply is complete
+LLM_COMMANDS = ('SWITCH_TO:', 'FETCH_LINK:')
+
+# User preference -> (feature bit, score weight)
+PREFERENCE_FEATURES = {
+    'lounge access': (FEATURE_LOUNGE, 18),
+    'fuel surcharge waiver': (FEATURE_FUEL, 15),
+    'cashback': (FEATURE_CASHBACK, 18),
+    'travel rewards': (FEATURE_TRAVEL, 16),
+    'movie benefits': (FEATURE_MOVIES, 12),
+    'dining discounts': (FEATURE_DINING, 12),
+    'railway benefits': (FEATURE_RAILWAY, 12),
+    'welcome benefits': (FEATURE_WELCOME, 8),
+    'milestone rewards': (FEATURE_MILESTONE, 10),
+    'insurance coverage': (FEATURE_INSURANCE, 8),
+}
+
+def _jdumps(obj, pretty: bool = False) -> str:
+    """Serialize to a JSON string with orjson, compact unless pretty"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+
 class CreditCardChatbot:
     def __init__(self, json_path: str):
         self.cards = self._load_cards(json_path)
-        self.llm = ChatCohere(
-            model=os.getenv("MODEL_NAME"),
-            cohere_api_key=os.getenv("COHERE_API_KEY"),
-            temperature=0.3
-        )
+        self._income_index = self._build_income_index()
+        self._badge_vocab = frozenset().union(*(card['_badges_lower'] for card in self.cards))
+        
         self.user_prefs = {}
-        self.conversation_history = []
+        self._user_prefs_json = None  # compact JSON of user_prefs, reset when they change
+        self.conversation_history = deque(maxlen=CONVERSATION_HISTORY_SIZE)
         self.session_state = {
             'recommended_cards': [],
             'current_card': None,
-            'excluded_institutions': [],
+            'excluded_institutions': set(),
             'llm_calls_count': 0
         }
         
-        # Initialize web browsing tools
-        self.web_tools = self._setup_web_tools()
+        # (url, max_chars) -> (expires_at, text), kept in LRU order
+        self._page_cache = OrderedDict()
+        self._page_cache_lock = threading.Lock()
+        self._disk_cache_lock = threading.Lock()
+        
+        # Follow-up questions queued with /add, answered in one LLM call
+        self._pending_questions = []
+        
+        # Hash of (handler, card, preferences, question) -> raw follow-up LLM response, kept in LRU order
+        self._response_cache = OrderedDict()
+        
+        # (handler, card and preferences scope, unit question embedding, raw response), oldest dropped first
+        self._semantic_cache = deque(maxlen=SEMANTIC_CACHE_SIZE)
+        self._semantic_cache_lock = threading.Lock()  # answers are also added from worker threads
         
+    @cached_property
+    def llm(self) -> "ChatCohere":
+        """Chat model, created on first use"""
+        return self._new_chat_model(os.getenv("MODEL_NAME"))
+    
+    @cached_property
+    def llm_cheap(self) -> "ChatCohere":
+        """Smaller chat model for routine follow-ups, or the main model when CHEAP_MODEL_NAME is unset"""
+        model = os.getenv("CHEAP_MODEL_NAME")
+        return self._new_chat_model(model) if model else self.llm
+    
+    def _new_chat_model(self, model: Optional[str]) -> "ChatCohere":
+        """Cohere chat model sharing the persistent LLM response cache"""
+        from langchain.globals import get_llm_cache, set_llm_cache
+        from langchain_community.cache import SQLiteCache
+        from langchain_cohere import ChatCohere
+        
+        # Exact-prompt LLM response cache, persisted across sessions
+        if get_llm_cache() is None:
+            set_llm_cache(SQLiteCache(database_path=os.getenv("LLM_CACHE_PATH", ".lc_cache.db")))
+        
+        return ChatCohere(
+            model=model,
+            cohere_api_key=os.getenv("COHERE_API_KEY"),
+            temperature=0.3
+        )
+    
+    @cached_property
+    def embeddings(self) -> Optional["CohereEmbeddings"]:
+        """Embedding model for the semantic response cache, or None when EMBEDDING_MODEL is unset"""
+        model = os.getenv("EMBEDDING_MODEL")
+        if not model:
+            return None
+        
+        from langchain_cohere import CohereEmbeddings
+        return CohereEmbeddings(model=model, cohere_api_key=os.getenv("COHERE_API_KEY"))
+    
+    def _invoke(self, template: "BasePromptTemplate", llm: Optional["ChatCohere"] = None, **inputs) -> str:
+        """Render a prompt template and return the chat model's reply text"""
+        return (llm or self.llm).invoke(template.format_prompt(**inputs)).content
+    
+    def _stream(self, template: "BasePromptTemplate", llm: Optional["ChatCohere"] = None, **inputs) -> Iterator[str]:
+        """Render a prompt template and yield the chat model's reply as text chunks"""
+        from langchain.globals import get_llm_cache
+        from langchain_core.load import dumps
+        from langchain_core.messages import AIMessage
+        from langchain_core.outputs import ChatGeneration
+        
+        model = llm or self.llm
+        messages = template.format_prompt(**inputs).to_messages()
+        
+        # stream() skips the LLM cache, so look the reply up and store it under
+        # the same key invoke() uses; a cached reply is yielded as one chunk
+        cache = get_llm_cache()
+        prompt, llm_string = dumps(messages), model._get_llm_string()
+        if cache is not None:
+            cached = cache.lookup(prompt, llm_string)
+            if cached:
+                yield cached[0].text
+                return
+        
+        parts = []
+        for chunk in model.stream(messages):
+            parts.append(chunk.content)
+            yield chunk.content
+        
+        if cache is not None:
+            cache.update(prompt, llm_string, [ChatGeneration(message=AIMessage(content="".join(parts)))])
+    
+    def _print_stream(self, chunks: Iterable[str]) -> str:
+        """Echo text to stdout as it arrives, hiding LLM command lines, and return the full text"""
+        parts = []
+        pending = ""
+        hiding = False
+        
+        for chunk in chunks:
+            parts.append(chunk)
+            pending += chunk
+            while pending:
+                if hiding:
+                    # Drop the command up to the end of its line
+                    newline = pending.find('\n')
+                    if newline == -1:
+                        pending = ""
+                        break
+                    pending = pending[newline + 1:]
+                    hiding = False
+                    continue
+                
+                starts = [index for index in (pending.find(command) for command in LLM_COMMANDS) if index != -1]
+                if starts:
+                    sys.stdout.write(pending[:min(starts)])
+                    pending = pending[min(starts):]
+                    hiding = True
+                    continue
+                
+                # Hold back a tail that may be the start of a command split across chunks
+                held = next(
+                    (size for size in range(min(len(pending), max(map(len, LLM_COMMANDS))), 0, -1)
+                     if any(command.startswith(pending[-size:]) for command in LLM_COMMANDS)),
+                    0
+                )
+                sys.stdout.write(pending[:len(pending) - held])
+                pending = pending[len(pending) - held:]
+                break
+            sys.stdout.flush()
+        
+        if not hiding:
+            sys.stdout.write(pending)
+        sys.stdout.flush()
+        return "".join(parts)
+    
+    @cached_property
+    def _prompts(self) -> "ModuleType":
+        """Prompt template module, imported on first use because it loads LangChain"""
+        import prompts
+        return prompts
+    
     def _load_cards(self, path: str) -> List[Dict]:
         """Load and validate card data"""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                cards = json.load(f)
-            
-            # Validate and clean card data
+            # Validate and clean card data as records are read
             valid_cards = []
-            for card in cards:
+            total_cards = 0
+            for record in self._read_catalog(path):
+                total_cards += 1
+                # Keep only the fields the chatbot reads
+                card = {key: record[key] for key in CARD_FIELDS if key in record}
                 if (card.get('name') and 
                     card.get('Institution') and 
                     card.get('Institution') != 'None' and
                     card.get('Institution') is not None):
+                    card['_feature_mask'] = self._compute_mask(card)
+                    card['_badges_lower'] = frozenset(badge.lower() for badge in card.get('badge', []))
+                    card['_cached_features'] = self._compute_key_features(card)
                     valid_cards.append(card)
             
-            logger.info(f"Loaded {len(valid_cards)} valid cards from {len(cards)} total cards")
+            logger.info(f"Loaded {len(valid_cards)} valid cards from {total_cards} total cards")
             return valid_cards
         except Exception as e:
             logger.error(f"Error loading cards: {e}")
             return []
     
-    def _setup_web_tools(self) -> List[Tool]:
-        """Setup LangChain tools for web browsing"""
+    def _read_catalog(self, path: str) -> Iterator[Dict]:
+        """Yield card records, streaming large catalogs instead of parsing them whole"""
+        if os.path.getsize(path) > CATALOG_STREAM_THRESHOLD:
+            import ijson
+            
+            with open(path, 'rb') as f:
+                yield from ijson.items(f, 'item', use_float=True)
+        else:
+            with open(path, 'rb') as f:
+                yield from orjson.loads(f.read())
+    
+    def _build_income_index(self) -> Dict[Optional[str], Tuple[List[int], List[int]]]:
+        """Sort card indices by minimum income for each employment type"""
+        index = {}
+        for employment in ('salaried', 'self-employed', None):
+            thresholds = sorted(
+                (self._income_threshold(card.get('eligibility_income_min') or {}, employment), i)
+                for i, card in enumerate(self.cards)
+            )
+            index[employment] = ([threshold for threshold, _ in thresholds], [i for _, i in thresholds])
+        return index
+    
+    @staticmethod
+    def _income_threshold(income_req: Dict, employment: Optional[str]) -> int:
+        """Minimum income a card requires for the given employment type"""
+        if employment == 'salaried' and income_req.get('salaried'):
+            return income_req['salaried']
+        elif employment == 'self-employed' and income_req.get('self_employed'):
+            return income_req['self_employed']
+        elif income_req.get('Any'):
+            return income_req['Any']
+        return 0
+    
+    def _compute_mask(self, card: Dict) -> int:
+        """Flatten rewards and fee text once and encode card features as bits"""
+        rewards_data = card.get('rewards', [])
+        if isinstance(rewards_data, dict):
+            rewards = rewards_data.get('rewards', [])
+        else:
+            rewards = rewards_data if isinstance(rewards_data, list) else []
+        
+        fee_data = card.get('fee_breakdown', [])
+        if isinstance(fee_data, dict):
+            fee_breakdown = fee_data.get('fee_breakdown', [])
+        else:
+            fee_breakdown = fee_data if isinstance(fee_data, list) else []
+        
+        rewards_blob = '\n'.join(str(reward) for reward in rewards).lower()
+        fees_blob = '\n'.join(str(fee) for fee in fee_breakdown).lower()
+        
+        hits = set(_KEYWORD_RE.findall(rewards_blob))
+        
+        mask = 0
+        if 'lounge' in hits:
+            mask |= FEATURE_LOUNGE
+        if 'fuel' in hits or 'fuel' in fees_blob:
+            mask |= FEATURE_FUEL
+        if 'cashback' in hits:
+            mask |= FEATURE_CASHBACK
+        if not hits.isdisjoint(('travel', 'miles', 'milestone', 'points', 'air')):
+            mask |= FEATURE_TRAVEL
+        if 'movie' in hits or 'pvr' in hits:
+            mask |= FEATURE_MOVIES
+        if 'dining' in hits or 'restaurant' in hits:
+            mask |= FEATURE_DINING
+        if 'railway' in hits or 'irctc' in hits:
+            mask |= FEATURE_RAILWAY
+        if 'welcome' in hits:
+            mask |= FEATURE_WELCOME
+        if 'milestone' in hits:
+            mask |= FEATURE_MILESTONE
+        if 'insurance' in hits or 'cover' in hits:
+            mask |= FEATURE_INSURANCE
+        
+        for fee in fee_breakdown:
+            if isinstance(fee, dict):
+                if fee.get('type') == 'joining_fee':
+                    fee_details = ' '.join(fee.get('details', [])).lower()
+                    if 'nil' in fee_details or 'waived' in fee_details or '0' in fee_details or 'free' in fee_details:
+                        mask |= FEATURE_JOINING_FEE_LOW
+                elif fee.get('type') == 'annual_fee':
+                    fee_details = ' '.join(fee.get('details', [])).lower()
+                    if 'nil' in fee_details or 'waived' in fee_details or '0' in fee_details or 'free' in fee_details or 'lifetime' in fee_details:
+                        mask |= FEATURE_ANNUAL_FEE_LOW
+        
+        return mask
+    
+    def _public_card(self, card: Dict) -> Dict:
+        """Card data without the precomputed private fields"""
+        return {key: value for key, value in card.items() if not key.startswith('_')}
+    
+    def _prefs_json(self) -> str:
+        """Compact, key-sorted JSON of the user preferences, serialized once per change"""
+        if self._user_prefs_json is None:
+            self._user_prefs_json = orjson.dumps(self.user_prefs, option=orjson.OPT_SORT_KEYS).decode()
+        return self._user_prefs_json
+    
+    def _compact_card(self, card: Dict) -> Dict:
+        """Only the card fields follow-up answers draw on, with at most two link URLs"""
+        compact = {key: card[key] for key in COMPACT_CARD_FIELDS if key in card}
+        compact['links'] = [link.get('uri') for link in card.get('links', [])[:2]]
+        return compact
+    
+    @cached_property
+    def _http(self) -> "requests.Session":
+        """Shared pooled HTTP session so repeat fetches reuse open connections"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.headers.update({'User-Agent': os.getenv("USER_AGENT") or DEFAULT_USER_AGENT})
+        
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    @cached_property
+    def _fetch_executor(self) -> ThreadPoolExecutor:
+        """Worker threads for page fetches and background embeddings, started once and reused by every follow-up"""
+        return ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fetch")
+    
+    @cached_property
+    def web_tools(self) -> List["Tool"]:
+        """LangChain tools for web browsing, created on first use"""
+        from langchain.tools import Tool
+        
         
         def browse_page(url: str) -> str:
             """Browse a specific page and extract content"""
@@ -73,11 +513,7 @@ class CreditCardChatbot:
                 f"https://www.google.com/search?q={query.replace(' ', '+')}+credit+card+india",
             ]
             
-            results = []
-            for url in search_urls[:1]:  # Limit to prevent too many requests
-                content = self._fetch_web_content(url, max_chars=1500)
-                if content:
-                    results.append(content)
+            results = [content for content in self._fetch_many(search_urls, max_chars=1500) if content]
             
             return "\n\n".join(results) if results else "No search results found"
         
@@ -212,6 +648,8 @@ class CreditCardChatbot:
             except ValueError:
                 pass
         
+        self._user_prefs_json = None
+        
         print("\n" + "="*60)
         print("Thank you! Let me find the best credit card for you...")
         print("="*60 + "\n")
@@ -227,22 +665,17 @@ class CreditCardChatbot:
         user_employment = self.user_prefs.get('employment')
         user_credit_score = self.user_prefs.get('credit_score')
         
-        for card in self.cards:
+        # Only cards whose income threshold the user meets, in catalog order
+        thresholds, card_idxs = self._income_index.get(user_employment, self._income_index[None])
+        cut = bisect.bisect_right(thresholds, user_income)
+        
+        for i in sorted(card_idxs[:cut]):
+            card = self.cards[i]
+            
             # Skip excluded institutions
             if card.get('Institution') in self.session_state['excluded_institutions']:
                 continue
             
-            # Check income eligibility
-            income_req = card.get('eligibility_income_min', {})
-            income_eligible = True
-            
-            if user_employment == 'salaried' and income_req.get('salaried'):
-                income_eligible = user_income >= income_req['salaried']
-            elif user_employment == 'self-employed' and income_req.get('self_employed'):
-                income_eligible = user_income >= income_req['self_employed']
-            elif income_req.get('Any'):
-                income_eligible = user_income >= income_req['Any']
-            
             # Check credit score if specified
             credit_eligible = True
             if user_credit_score and card.get('minimum_credit_score'):
@@ -255,7 +688,7 @@ class CreditCardChatbot:
             elif card.get('is_bank_customer_only') and not self.user_prefs.get('preferred_bank'):
                 bank_eligible = False  # User doesn't have preferred bank but card requires it
             
-            if income_eligible and credit_eligible and bank_eligible:
+            if credit_eligible and bank_eligible:
                 eligible_cards.append(card)
         
         return eligible_cards
@@ -264,130 +697,43 @@ class CreditCardChatbot:
         """Score and rank cards based on user preferences without LLM"""
         scored_cards = []
         
+        # Translate preferences into feature bits once per call
+        user_prefs = self.user_prefs.get('preferences', [])
+        wants_low_fees = 'low fees' in user_prefs or 'no annual fee' in user_prefs
+        user_features = [PREFERENCE_FEATURES[pref] for pref in set(user_prefs) if pref in PREFERENCE_FEATURES]
+        relevant_mask = FEATURE_JOINING_FEE_LOW | FEATURE_ANNUAL_FEE_LOW if wants_low_fees else 0
+        for bit, _ in user_features:
+            relevant_mask |= bit
+        pref_scores = {}  # relevant feature bits -> preference score
+        
+        user_categories = frozenset(cat.lower() for cat in self.user_prefs.get('categories', []))
+        
+        # For each user category, the catalog badges it partially matches
+        related_badges = [
+            frozenset(badge for badge in self._badge_vocab if cat in badge or badge in cat)
+            for cat in user_categories
+        ]
+        
         for card in eligible_cards:
             score = 0
             
             # Category matching - improved with exact and partial matching
-            card_badges = [badge.lower() for badge in card.get('badge', [])]
-            user_categories = [cat.lower() for cat in self.user_prefs.get('categories', [])]
+            card_badges = card['_badges_lower']
             
             # Exact category matches
-            exact_matches = sum(1 for cat in user_categories if cat in card_badges)
+            exact_matches = len(user_categories & card_badges)
             score += exact_matches * 15
             
             # Partial category matches (e.g., 'travel' matches 'co-branded' travel cards)
-            partial_matches = 0
-            for user_cat in user_categories:
-                for card_badge in card_badges:
-                    if user_cat in card_badge or card_badge in user_cat:
-                        partial_matches += 1
-                        break
+            partial_matches = sum(1 for badges in related_badges if not badges.isdisjoint(card_badges))
             score += (partial_matches - exact_matches) * 8  # Avoid double counting
             
-            # Preference matching - enhanced scoring
-            user_prefs = self.user_prefs.get('preferences', [])
-            
-            # Get rewards and fee data safely
-            rewards_data = card.get('rewards', [])
-            if isinstance(rewards_data, dict):
-                rewards = rewards_data.get('rewards', [])
-            else:
-                rewards = rewards_data if isinstance(rewards_data, list) else []
-            
-            fee_data = card.get('fee_breakdown', [])
-            if isinstance(fee_data, dict):
-                fee_breakdown = fee_data.get('fee_breakdown', [])
-            else:
-                fee_breakdown = fee_data if isinstance(fee_data, list) else []
-            
-            # Low fees / No annual fee preference
-            if 'low fees' in user_prefs or 'no annual fee' in user_prefs:
-                joining_fee_low = False
-                annual_fee_low = False
-                
-                for fee in fee_breakdown:
-                    if isinstance(fee, dict):
-                        if fee.get('type') == 'joining_fee':
-                            fee_details = ' '.join(fee.get('details', [])).lower()
-                            if 'nil' in fee_details or 'waived' in fee_details or '0' in fee_details or 'free' in fee_details:
-                                joining_fee_low = True
-                        elif fee.get('type') == 'annual_fee':
-                            fee_details = ' '.join(fee.get('details', [])).lower()
-                            if 'nil' in fee_details or 'waived' in fee_details or '0' in fee_details or 'free' in fee_details or 'lifetime' in fee_details:
-                                annual_fee_low = True
-                
-                if joining_fee_low and annual_fee_low:
-                    score += 20
-                elif annual_fee_low:  # Annual fee waiver is more important
-                    score += 15
-                elif joining_fee_low:
-                    score += 10
-            
-            # Lounge access preference
-            if 'lounge access' in user_prefs:
-                has_lounge = any('lounge' in str(reward).lower() for reward in rewards)
-                if has_lounge:
-                    score += 18
-            
-            # Fuel surcharge waiver preference
-            if 'fuel surcharge waiver' in user_prefs:
-                has_fuel_benefit = (
-                    any('fuel' in str(reward).lower() for reward in rewards) or
-                    any('fuel' in str(fee).lower() for fee in fee_breakdown)
-                )
-                if has_fuel_benefit:
-                    score += 15
-            
-            # Cashback preference
-            if 'cashback' in user_prefs:
-                has_cashback = any('cashback' in str(reward).lower() for reward in rewards)
-                if has_cashback:
-                    score += 18
-            
-            # Travel rewards preference
-            if 'travel rewards' in user_prefs:
-                has_travel_rewards = any(
-                    any(keyword in str(reward).lower() for keyword in ['travel', 'miles', 'points', 'air']) 
-                    for reward in rewards
-                )
-                if has_travel_rewards:
-                    score += 16
-            
-            # Movie benefits preference
-            if 'movie benefits' in user_prefs:
-                has_movie_benefits = any('movie' in str(reward).lower() or 'pvr' in str(reward).lower() for reward in rewards)
-                if has_movie_benefits:
-                    score += 12
-            
-            # Dining discounts preference
-            if 'dining discounts' in user_prefs:
-                has_dining_benefits = any('dining' in str(reward).lower() or 'restaurant' in str(reward).lower() for reward in rewards)
-                if has_dining_benefits:
-                    score += 12
-            
-            # Railway benefits preference
-            if 'railway benefits' in user_prefs:
-                has_railway_benefits = any('railway' in str(reward).lower() or 'irctc' in str(reward).lower() for reward in rewards)
-                if has_railway_benefits:
-                    score += 12
-            
-            # Welcome benefits preference
-            if 'welcome benefits' in user_prefs:
-                has_welcome_benefits = any('welcome' in str(reward).lower() for reward in rewards)
-                if has_welcome_benefits:
-                    score += 8
-            
-            # Milestone rewards preference
-            if 'milestone rewards' in user_prefs:
-                has_milestone_benefits = any('milestone' in str(reward).lower() for reward in rewards)
-                if has_milestone_benefits:
-                    score += 10
-            
-            # Insurance coverage preference
-            if 'insurance coverage' in user_prefs:
-                has_insurance = any('insurance' in str(reward).lower() or 'cover' in str(reward).lower() for reward in rewards)
-                if has_insurance:
-                    score += 8
+            # Preference matching - cards with the same relevant feature bits share one score
+            features = card['_feature_mask'] & relevant_mask
+            pref_score = pref_scores.get(features)
+            if pref_score is None:
+                pref_score = pref_scores[features] = self._preference_score(features, user_features, wants_low_fees)
+            score += pref_score
             
             # Preferred bank bonus
             if (self.user_prefs.get('preferred_bank') and 
@@ -400,7 +746,7 @@ class CreditCardChatbot:
                 if 'premium' in card_badges or 'signature' in card.get('name', '').lower():
                     score += 10
             elif user_income >= 500000:  # 5+ lakhs
-                if any(badge in card_badges for badge in ['lifestyle', 'rewards', 'travel']):
+                if not card_badges.isdisjoint(('lifestyle', 'rewards', 'travel')):
                     score += 5
             
             scored_cards.append((card, score))
@@ -409,6 +755,26 @@ class CreditCardChatbot:
         scored_cards.sort(key=lambda x: x[1], reverse=True)
         return [card for card, score in scored_cards]
     
+    @staticmethod
+    def _preference_score(features: int, user_features: List[Tuple[int, int]], wants_low_fees: bool) -> int:
+        """Preference score for a set of card feature bits"""
+        score = 0
+        
+        # Low fees / No annual fee preference
+        if wants_low_fees:
+            joining_fee_low = features & FEATURE_JOINING_FEE_LOW
+            annual_fee_low = features & FEATURE_ANNUAL_FEE_LOW
+            
+            if joining_fee_low and annual_fee_low:
+                score += 20
+            elif annual_fee_low:  # Annual fee waiver is more important
+                score += 15
+            elif joining_fee_low:
+                score += 10
+        
+        score += sum(weight for bit, weight in user_features if features & bit)
+        return score
+    
     def llm_recommend_and_explain(self, top_cards: List[Dict]) -> Optional[Dict]:
         """Use LLM for intelligent card analysis and recommendation"""
         if not top_cards:
@@ -417,66 +783,22 @@ class CreditCardChatbot:
         # Increment LLM call counter
         self.session_state['llm_calls_count'] += 1
         
-        # Prepare comprehensive card data for LLM analysis
-        cards_for_llm = []
-        for card in top_cards[:5]:  # Analyze top 5 instead of 3
-            card_summary = {
-                'name': card.get('name'),
-                'institution': card.get('Institution'),
-                'categories': card.get('badge', []),
-                'rewards': card.get('rewards', {}),
-                'fees': card.get('fee_breakdown', {}),
-                'eligibility': card.get('eligibility_income_min', {}),
-                'interest_rate': card.get('interest_rate'),
-                'bank_requirement': card.get('is_bank_customer_only'),
-                'key_features': self._extract_key_features(card)
-            }
-            cards_for_llm.append(card_summary)
-        
-        prompt = PromptTemplate(
-            input_variables=["user_prefs", "top_cards"],
-            template=RECOMMENDATION_PROMPT
-        )
-        
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+        # Prepare comprehensive card data for LLM analysis (top 5 instead of 3)
+        top_cards_json = '[' + ','.join(self._card_summary_json(card) for card in top_cards[:5]) + ']'
         
-        try:
-            response = chain.run(
-                user_prefs=json.dumps(self.user_prefs, indent=2),
-                top_cards=json.dumps(cards_for_llm, indent=2)
-            )
-            
-            # Extract recommended card name
-            lines = response.split('\n')
-            recommended_name = None
-            explanation = ""
-            
-            for line in lines:
-                if line.startswith('RECOMMENDED CARD:'):
-                    recommended_name = line.replace('RECOMMENDED CARD:', '').strip()
-                elif line.startswith('EXPLANATION:'):
-                    explanation = line.replace('EXPLANATION:', '').strip()
-            
-            # Find the recommended card
-            recommended_card = None
-            if recommended_name:
-                for card in top_cards:
-                    if recommended_name.lower() in card.get('name', '').lower():
-                        recommended_card = card
-                        break
-            
-            # Fallback to first card if not found
-            if not recommended_card:
-                recommended_card = top_cards[0]
-                explanation = f"Based on your preferences, I recommend the {recommended_card.get('name')} as it best matches your requirements."
-            
-            # Display recommendation
+        def show_header(card: Dict):
             print("\n" + "="*60)
             print("YOUR RECOMMENDED CREDIT CARD")
             print("="*60)
-            print(f"\nCard: {recommended_card.get('name')}")
-            print(f"Issuer: {recommended_card.get('Institution')}")
-            print(f"\n{explanation}\n")
+            print(f"\nCard: {card.get('name')}")
+            print(f"Issuer: {card.get('Institution')}")
+        
+        try:
+            # Fallback to first card if the response names none
+            fallback = f"Based on your preferences, I recommend the {top_cards[0].get('name')} as it best matches your requirements."
+            _, _, recommended_card = self._present_recommendation(
+                self._stream_recommendation(top_cards_json), top_cards, show_header, fallback
+            )
             
             # Add key details
             self._display_card_details(recommended_card)
@@ -491,6 +813,217 @@ class CreditCardChatbot:
             print(f"Issuer: {card.get('Institution')}")
             return card
     
+    def _stream_recommendation(self, top_cards_json: str) -> Iterator[str]:
+        """Stream the recommendation LLM response as text chunks; identical prompts are served by the LLM cache"""
+        return self._stream(self._prompts.RECOMMENDATION_TMPL, user_prefs=self._prefs_json(), top_cards=top_cards_json)
+    
+    def _present_recommendation(self, chunks: Iterable[str], top_cards: List[Dict],
+                                show_header: Callable[[Dict], None], fallback: str) -> Tuple[str, Optional[Dict], Dict]:
+        """Print a recommendation as it streams, the card header as soon as its line resolves; returns the response, the card it named and the card shown"""
+        response = ""
+        pending = ""
+        named_card = None
+        explanation = None  # explanation text so far, None until its line starts
+        explained = False   # the explanation line is complete
+        shown = None        # characters of the explanation printed, None before it starts
+        
+        def handle_line(line: str, complete: bool):
+            nonlocal named_card, explanation, explained, shown
+            label, sep, value = line.partition(':')
+            if not sep:
+                return
+            label = label.strip().upper().replace('_', ' ')
+            value = value.strip() if complete else value.lstrip()
+            
+            # Accept both label spellings used by the recommendation prompts
+            if label == 'RECOMMENDED CARD' and complete and value and named_card is None:
+                named_card = next((card for card in top_cards if value.lower() in card.get('name', '').lower()), None)
+                if named_card is not None:
+                    show_header(named_card)
+            elif label in ('EXPLANATION', 'PRESENTATION') and not explained:
+                explanation = value
+                explained = complete
+            
+            # Echo new explanation text once the header is out
+            if named_card is not None and explanation is not None:
+                if shown is None:
+                    sys.stdout.write("\n")
+                    shown = 0
+                sys.stdout.write(explanation[shown:])
+                sys.stdout.flush()
+                shown = max(shown, len(explanation))
+        
+        for chunk in chunks:
+            response += chunk
+            pending += chunk
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                handle_line(line, True)
+            handle_line(pending, False)
+        handle_line(pending, True)
+        
+        card = named_card
+        if card is None:
+            card = top_cards[0]
+            show_header(card)
+            sys.stdout.write(f"\n{fallback}")
+        elif shown is None:
+            sys.stdout.write("\n")
+        print("\n")
+        
+        return response, named_card, card
+    
+    def _profile_key(self, candidates: List[Dict]) -> str:
+        """Disk cache key shared by equivalent preference profiles with the same model, prompt and candidate cards"""
+        prompts = self._prompts
+        prompt_hash = hashlib.blake2b(
+            (prompts.RECOMMENDATION_SYSTEM_PROMPT + prompts.RECOMMENDATION_USER_PROMPT).encode(), digest_size=8
+        ).hexdigest()
+        
+        # Income and credit score only matter through the card thresholds they clear
+        employment = self.user_prefs.get('employment')
+        income_thresholds = self._income_index.get(employment, self._income_index[None])[0]
+        credit_score = self.user_prefs.get('credit_score')
+        
+        profile = [
+            os.getenv("MODEL_NAME"),
+            prompt_hash,
+            employment,
+            sorted({cat.lower() for cat in self.user_prefs.get('categories', [])}),
+            sorted({pref.lower() for pref in self.user_prefs.get('preferences', [])}),
+            (self.user_prefs.get('preferred_bank') or '').strip().casefold(),
+            bisect.bisect_right(income_thresholds, self.user_prefs.get('income', 0)),
+            None if credit_score is None else bisect.bisect_right(self._credit_score_thresholds, credit_score),
+            # Card content rather than names, so catalog edits are not served a stale reply
+            [self._card_summary_json(card) for card in candidates]
+        ]
+        return "rec|" + hashlib.blake2b(orjson.dumps(profile)).hexdigest()
+    
+    @cached_property
+    def _credit_score_thresholds(self) -> List[int]:
+        """Distinct minimum credit scores required across the catalog, ascending"""
+        return sorted({card['minimum_credit_score'] for card in self.cards if card.get('minimum_credit_score')})
+    
+    def _response_scope(self, handler: str, card: Dict) -> str:
+        """Everything besides the question and recent turns that a follow-up answer depends on"""
+        scope = f"{handler}|{card.get('name')}|{self._prefs_json()}"
+        if handler == 'conversation':
+            # The conversational prompt also sees the alternatives
+            alternatives = [alt.get('name') for alt in self.session_state.get('recommended_cards', [])[:10]]
+            scope += f"|{_jdumps(alternatives)}"
+        return scope
+    
+    def _cached_followup(self, handler: str, question: str, card: Dict, generate: Callable[[], str]) -> str:
+        """Answer a follow-up from the exact or semantic response cache, calling generate on a miss"""
+        # Recent turns are left out of the cache key so a repeated question can match;
+        # anything that is not a self-contained question may refer back to them and
+        # always goes to the model
+        if not self._is_standalone(question):
+            self.session_state['llm_calls_count'] += 1
+            return generate()
+        
+        scope = self._response_scope(handler, card)
+        cache_key = hashlib.blake2b(f"{scope}|{question}".encode()).hexdigest()
+        response = self._get_cached_response(cache_key)
+        if response is not None:
+            return response
+        
+        # Only pay for an embedding when an earlier answer in this scope could match
+        vector = None
+        entries = self._semantic_entries(scope)
+        if entries:
+            vector = self._embed_question(question)
+            if vector is not None:
+                response = self._find_similar_response(entries, vector)
+        
+        if response is None:
+            self.session_state['llm_calls_count'] += 1
+            response = generate()
+            if vector is not None:
+                self._add_semantic_entry(scope, vector, response)
+            elif self.embeddings is not None:
+                # The first answer in a scope is embedded off the main thread
+                self._fetch_executor.submit(self._remember_answer, scope, question, response)
+        
+        self._store_cached_response(cache_key, response)
+        return response
+    
+    @staticmethod
+    def _is_standalone(question: str) -> bool:
+        """Whether a follow-up means the same thing whatever the previous turn was"""
+        return (len(question.split()) >= STANDALONE_QUESTION_WORDS
+                and _STANDALONE_RE.match(question) is not None
+                and _CONTEXTUAL_RE.search(question) is None)
+    
+    def _remember_answer(self, scope: str, question: str, response: str):
+        """Add an answer to the semantic cache under its question's embedding"""
+        vector = self._embed_question(question)
+        if vector is not None:
+            self._add_semantic_entry(scope, vector, response)
+    
+    def _semantic_entries(self, scope: str) -> List[Tuple[List[float], str]]:
+        """Snapshot of the semantic cache's (embedding, response) pairs in one scope"""
+        with self._semantic_cache_lock:
+            return [(vector, response) for entry_scope, vector, response in self._semantic_cache if entry_scope == scope]
+    
+    def _add_semantic_entry(self, scope: str, vector: List[float], response: str):
+        """Add an answer to the semantic cache, dropping the oldest once full"""
+        with self._semantic_cache_lock:
+            self._semantic_cache.append((scope, vector, response))
+    
+    def _embed_question(self, question: str) -> Optional[List[float]]:
+        """Unit-length embedding of a question, or None when semantic caching is off or fails"""
+        if self.embeddings is None:
+            return None
+        
+        try:
+            vector = self.embeddings.embed_query(question)
+        except Exception as e:
+            logger.warning(f"Embedding failed: {e}")
+            return None
+        
+        norm = math.sqrt(sum(x * x for x in vector))
+        return [x / norm for x in vector] if norm else None
+    
+    def _find_similar_response(self, entries: List[Tuple[List[float], str]], vector: List[float]) -> Optional[str]:
+        """Cached response to the most similar earlier question among entries, if close enough"""
+        best_score, best_response = SEMANTIC_CACHE_THRESHOLD, None
+        for entry_vector, response in entries:
+            score = sum(a * b for a, b in zip(vector, entry_vector))
+            if score >= best_score:
+                best_score, best_response = score, response
+        return best_response
+
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Return a cached follow-up response, marking it recently used"""
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
+        return response
+    
+    def _store_cached_response(self, key: str, response: str):
+        """Cache a follow-up response, evicting the least recently used entries"""
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    def _card_summary_json(self, card: Dict) -> str:
+        """Compact JSON summary of a card for LLM prompts, memoized on the card"""
+        if '_llm_summary' not in card:
+            card['_llm_summary'] = orjson.dumps({
+                'name': card.get('name'),
+                'institution': card.get('Institution'),
+                'categories': card.get('badge', []),
+                'rewards': card.get('rewards', {}),
+                'fees': card.get('fee_breakdown', {}),
+                'eligibility': card.get('eligibility_income_min', {}),
+                'interest_rate': card.get('interest_rate'),
+                'bank_requirement': card.get('is_bank_customer_only'),
+                'key_features': self._extract_key_features(card)
+            }).decode()
+        return card['_llm_summary']
+    
     def _display_card_details(self, card: Dict):
         """Display key card details in a friendly way"""
         print("KEY DETAILS:")
@@ -579,63 +1112,34 @@ class CreditCardChatbot:
         if not top_cards:
             return None
         
-        self.session_state['llm_calls_count'] += 1
-        
         # Prepare card data
-        cards_for_llm = []
-        for card in top_cards[:3]:
-            cards_for_llm.append({
-                'name': card.get('name'),
-                'institution': card.get('Institution'),
-                'categories': card.get('badge', []),
-                'key_features': self._extract_key_features(card),
-                'rewards': card.get('rewards', {}),
-                'fees': card.get('fee_breakdown', {})
-            })
-        
-        prompt = PromptTemplate(
-            input_variables=["user_prefs", "top_cards"],
-            template=RECOMMENDATION_PROMPT
-        )
-        
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+        candidates = top_cards[:3]
+        top_cards_json = '[' + ','.join(self._card_summary_json(card) for card in candidates) + ']'
         
         try:
-            response = chain.run(
-                user_prefs=json.dumps(self.user_prefs, indent=2),
-                top_cards=json.dumps(cards_for_llm, indent=2)
-            )
-            
-            # Parse response
-            lines = response.split('\n')
-            recommended_name = None
-            presentation = ""
+            cache_key = self._profile_key(candidates)
+            response = self._load_stored(cache_key)
+            cached = response is not None
+            if cached:
+                chunks = [response]
+            else:
+                self.session_state['llm_calls_count'] += 1
+                chunks = self._stream_recommendation(top_cards_json)
             
-            for line in lines:
-                if line.startswith('RECOMMENDED_CARD:'):
-                    recommended_name = line.replace('RECOMMENDED_CARD:', '').strip()
-                elif line.startswith('PRESENTATION:'):
-                    presentation = line.replace('PRESENTATION:', '').strip()
-            
-            # Find the card
-            recommended_card = None
-            if recommended_name:
-                for card in top_cards:
-                    if recommended_name.lower() in card.get('name', '').lower():
-                        recommended_card = card
-                        break
+            # Present the recommendation conversationally
+            def show_header(card: Dict):
+                print("\n" + "=" * 50)
+                print("RECOMMENDED CREDIT CARD")
+                print("=" * 50)
+                print(f"\nCard: {card.get('name')}")
+                print(f"Bank: {card.get('Institution')}")
             
-            if not recommended_card:
-                recommended_card = top_cards[0]
-                presentation = f"I found the perfect card for you! The {recommended_card.get('name')} matches your preferences beautifully."
+            fallback = f"I found the perfect card for you! The {top_cards[0].get('name')} matches your preferences beautifully."
+            response, named_card, recommended_card = self._present_recommendation(chunks, top_cards, show_header, fallback)
             
-            # Present the recommendation conversationally
-            print("\n" + "=" * 50)
-            print("RECOMMENDED CREDIT CARD")
-            print("=" * 50)
-            print(f"\nCard: {recommended_card.get('name')}")
-            print(f"Bank: {recommended_card.get('Institution')}")
-            print(f"\n{presentation}\n")
+            # Only replies that name a card are kept, so a bad reply is not replayed for a week
+            if named_card and not cached:
+                self._save_stored(cache_key, response, RECOMMENDATION_CACHE_TTL)
             
             # Show key details
             self._display_card_details(recommended_card)
@@ -652,35 +1156,154 @@ class CreditCardChatbot:
     
     def _fetch_web_content(self, url: str, max_chars: int = 2000) -> str:
         """Fetch and extract text content from a URL"""
+        key = (url, max_chars)
+        cached = self._get_cached_page(key)
+        if cached is None:
+            cached = self._load_stored(f"{key[1]}|{key[0]}")
+            if cached is not None:
+                self._store_cached_page(key, cached)
+        if cached is not None:
+            return cached
+        
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                element.decompose()
+            with self._http.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                
+                # Charset only if the server declared one; requests otherwise guesses ISO-8859-1
+                encoding = response.encoding if 'charset=' in response.headers.get('Content-Type', '').lower() else None
+                
+                # Download only as much HTML as the text budget needs, widening the
+                # byte budget when scripts and markup leave too little text
+                content = bytearray()
+                budget = max_chars * HTML_BYTES_PER_TEXT_CHAR
+                for chunk in response.iter_content(chunk_size=16384):
+                    content.extend(chunk)
+                    if len(content) >= budget:
+                        text = self._parse_html(bytes(content), encoding)
+                        if len(text) >= max_chars:
+                            break
+                        budget *= 2
+                else:
+                    text = self._parse_html(bytes(content), encoding)
             
-            # Get text content
-            text = soup.get_text(separator=' ', strip=True)
-            text = ' '.join(text.split())  # Clean whitespace
+            text = text[:max_chars] if len(text) > max_chars else text
             
-            return text[:max_chars] if len(text) > max_chars else text
+            if text:
+                self._store_cached_page(key, text)
+                self._save_stored(f"{key[1]}|{key[0]}", text, WEB_CACHE_TTL)
+            return text
             
         except Exception as e:
             logger.warning(f"Failed to fetch {url}: {e}")
             return ""
     
+    def _get_cached_page(self, key: Tuple[str, int]) -> Optional[str]:
+        """Return cached page text if present and not expired"""
+        with self._page_cache_lock:
+            entry = self._page_cache.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, text = entry
+            if expires_at < time.monotonic():
+                del self._page_cache[key]
+                return None
+            
+            self._page_cache.move_to_end(key)
+            return text
+    
+    def _store_cached_page(self, key: Tuple[str, int], text: str):
+        """Cache page text, evicting the least recently used entries"""
+        with self._page_cache_lock:
+            self._page_cache[key] = (time.monotonic() + PAGE_CACHE_TTL, text)
+            self._page_cache.move_to_end(key)
+            while len(self._page_cache) > PAGE_CACHE_SIZE:
+                self._page_cache.popitem(last=False)
+    
+    @cached_property
+    def _disk_cache(self) -> Optional[shelve.Shelf]:
+        """On-disk page text and recommendation cache, or None if it cannot be opened (e.g. held by another session)"""
+        try:
+            return shelve.open(os.getenv("WEB_CACHE_PATH", ".web_cache"))
+        except Exception as e:
+            logger.warning(f"Disk cache unavailable: {e}")
+            return None
+    
+    def _load_stored(self, store_key: str) -> Optional[str]:
+        """Return text from the on-disk cache if present and not expired"""
+        with self._disk_cache_lock:
+            store = self._disk_cache
+            if store is None:
+                return None
+            
+            try:
+                entry = store.get(store_key)
+                if entry is None:
+                    return None
+                
+                expires_at, text = entry
+                if expires_at < time.time():
+                    del store[store_key]
+                    return None
+                return text
+            except Exception as e:
+                logger.warning(f"Disk cache read failed: {e}")
+                return None
+    
+    def _save_stored(self, store_key: str, text: str, ttl: float):
+        """Write text to the on-disk cache, expiring after ttl seconds"""
+        with self._disk_cache_lock:
+            store = self._disk_cache
+            if store is None:
+                return
+            
+            try:
+                store[store_key] = (time.time() + ttl, text)
+                store.sync()
+            except Exception as e:
+                logger.warning(f"Disk cache write failed: {e}")
+    
+    def _parse_html(self, content: bytes, encoding: Optional[str] = None) -> str:
+        """Extract readable text from raw HTML"""
+        import lxml.html
+        
+        if not content.strip():
+            return ""
+        
+        # Without a declared charset, prefer UTF-8 when the bytes decode as UTF-8
+        # (a character cut off at the end of a partial download is tolerated);
+        # otherwise leave libxml2 to honour the page's own meta charset
+        if encoding is None:
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(content)
+                encoding = 'utf-8'
+            except UnicodeDecodeError:
+                pass
+        
+        tree = lxml.html.fromstring(content, parser=lxml.html.HTMLParser(encoding=encoding))
+        
+        # Empty unwanted elements; their tail text belongs to the parent and is kept
+        for element in list(tree.iter(*_DROP_TAGS)):
+            element.clear(keep_tail=True)
+        
+        # Get text content
+        text = ' '.join(tree.itertext())
+        return ' '.join(text.split())  # Clean whitespace
+    
+    def _fetch_many(self, urls: List[str], max_chars: int = 2000) -> List[str]:
+        """Fetch several URLs concurrently, returning contents in the same order"""
+        if len(urls) <= 1:
+            return [self._fetch_web_content(url, max_chars=max_chars) for url in urls]
+        
+        # Each worker downloads and parses its own page, so parsing one page
+        # overlaps with the network wait of the others
+        return list(self._fetch_executor.map(lambda url: self._fetch_web_content(url, max_chars=max_chars), urls))
+    
     def handle_followup_with_web(self, question: str, card: Dict):
         """Handle follow-up questions using card links from JSON only"""
         
         # Check if question needs current info from card links
-        web_keywords = ['latest', 'current', 'offers', 'application', 'apply', 'website', 'official', 'bank']
-        needs_current_info = any(keyword in question.lower() for keyword in web_keywords)
+        needs_current_info = _WEB_KW_RE.search(question) is not None
         
         if needs_current_info and card.get('links'):
             print("\nFetching current information from official sources...")
@@ -689,14 +1312,16 @@ class CreditCardChatbot:
             web_content = ""
             bank_name = card.get('Institution', '').lower()
             
-            # Prioritize official bank links
+            # Prioritize official bank links: link titles are domains (e.g. axisbank.com),
+            # so the issuer's first word is matched as a substring, not as a whole word
+            bank_token = bank_name.split()[0] if bank_name.strip() else ''
             official_links = []
             other_links = []
             
             for link in card.get('links', []):
                 if link.get('uri'):
                     link_title = link.get('title', '').lower()
-                    if any(bank_word in link_title for bank_word in [bank_name.split()[0], 'bank.com', '.com']) and 'bank' in link_title:
+                    if bank_token and bank_token in link_title and 'bank' in link_title:
                         official_links.append(link)
                     else:
                         other_links.append(link)
@@ -704,29 +1329,24 @@ class CreditCardChatbot:
             # Try official links first, then others
             links_to_try = (official_links + other_links)[:3]  # Limit to 3 links
             
-            for link in links_to_try:
-                content = self._fetch_web_content(link['uri'], max_chars=1500)
+            contents = self._fetch_many([link['uri'] for link in links_to_try], max_chars=1500)
+            for link, content in zip(links_to_try, contents):
                 if content:
                     web_content += f"\nFrom {link.get('title', 'official source')}: {content}\n"
             
             if web_content:
                 self.session_state['llm_calls_count'] += 1
                 
-                prompt = PromptTemplate(
-                    input_variables=["question", "card_data", "web_content", "user_prefs"],
-                    template=FOLLOWUP_WITH_WEB_PROMPT
-                )
-                
-                chain = LLMChain(llm=self.llm, prompt=prompt)
-                
                 try:
-                    answer = chain.run(
+                    print()
+                    self._print_stream(self._stream(
+                        self._prompts.FOLLOWUP_WITH_WEB_TMPL,
                         question=question,
-                        card_data=json.dumps(card, indent=2),
+                        card_data=_jdumps(self._compact_card(card)),
                         web_content=web_content,
-                        user_prefs=json.dumps(self.user_prefs, indent=2)
-                    )
-                    print(f"\n{answer}\n")
+                        user_prefs=self._prefs_json()
+                    ))
+                    print("\n")
                     return
                 except Exception as e:
                     logger.error(f"LLM error with web content: {e}")
@@ -736,51 +1356,37 @@ class CreditCardChatbot:
     
     def handle_followup_json_only(self, question: str, card: Dict):
         """Handle follow-up questions using ONLY JSON data"""
-        self.session_state['llm_calls_count'] += 1
-        
-        # Enhanced prompt with JSON-only constraints
-        prompt = PromptTemplate(
-            input_variables=["question", "user_prefs", "card_data", "all_cards_data"],
-            template="""You are a credit card advisor. Answer using ONLY the provided JSON data.
-
-CRITICAL CONSTRAINTS:
-- Use ONLY information from the JSON card data provided
-- NEVER recommend cards not in the JSON dataset
-- If asked about features not in JSON, clearly state "This information is not available in our database"
-- Only suggest alternatives from the provided cards data
-
-User Question: {question}
-
-User Preferences: {user_prefs}
-
-Current Card (full JSON): {card_data}
-
-Available Alternative Cards (full JSON): {all_cards_data}
-
-Instructions:
-1. Answer the question using ONLY JSON data
-2. If current card lacks requested feature, suggest alternatives from JSON that have it
-3. Be honest about data limitations
-4. Provide specific JSON-based information
-5. Never invent or assume information not in JSON
-
-Response:"""
-        )
+        direct_answer, tier = self._triage_followup(question, card)
+        if direct_answer is not None:
+            print(f"\n{direct_answer}\n")
+            return
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+        streamed = False
         
-        try:
+        def generate() -> str:
+            nonlocal streamed
+            streamed = True
+            model = self._followup_model(tier)
+            
             # Get full JSON data for alternatives
             alternatives = self.session_state.get('recommended_cards', [])[:10]
-            alternative_cards = [alt_card for alt_card in alternatives if alt_card != card]
+            alternative_cards = [self._compact_card(alt_card) for alt_card in alternatives if alt_card.get('name') != card.get('name')]
             
-            answer = chain.run(
+            return self._print_stream(self._stream(
+                self._prompts.FOLLOWUP_JSON_ONLY_TMPL,
+                llm=model,
                 question=question,
-                user_prefs=json.dumps(self.user_prefs, indent=2),
-                card_data=json.dumps(card, indent=2),
-                all_cards_data=json.dumps(alternative_cards, indent=2)
-            )
-            print(f"\n{answer}\n")
+                user_prefs=self._prefs_json(),
+                card_data=_jdumps(self._compact_card(card)),
+                all_cards_data=_jdumps(alternative_cards)
+            ))
+        
+        try:
+            print()
+            answer = self._cached_followup('json_only', question, card, generate)
+            if not streamed:
+                sys.stdout.write(answer)
+            print("\n")
             
         except Exception as e:
             logger.error(f"LLM followup error: {e}")
@@ -788,7 +1394,132 @@ Response:"""
     
 
     
+    def _triage(self, question: str, card: Dict) -> Tuple[str, List[str]]:
+        """Classify a follow-up as 'extract' (with the facts asked for), 'cheap' or 'full'"""
+        words = len(question.split())
+        if words > LONG_QUESTION_WORDS or _COMPLEX_RE.search(question):
+            return 'full', []
+        
+        # Naming another catalog card or issuer makes it a question about that card
+        question_words = set(re.findall(r'[a-z0-9]+', question.lower()))
+        card_words = self._name_words(card)
+        if not question_words.isdisjoint(self._distinctive_name_words - card_words):
+            return 'full', []
+        
+        if words <= EXTRACTIVE_QUESTION_WORDS and not _PERSONAL_RE.search(question):
+            parts = _JOINED_PARTS_RE.split(question)
+            part_facts = [[fact for fact, pattern in _EXTRACTIVE_RES if pattern.search(part)] for part in parts]
+            
+            # Any part on another topic (e.g. "lounge access and the annual fee"), or any
+            # word the card data cannot speak to (e.g. "is the fee waived"), needs a model
+            if all(part_facts) and question_words <= _EXTRACTIVE_WORDS | self._fee_type_words | card_words:
+                return 'extract', list(dict.fromkeys(fact for facts in part_facts for fact in facts))
+        
+        return 'cheap', []
+    
+    def _triage_followup(self, question: str, card: Dict) -> Tuple[Optional[str], str]:
+        """Answer from the card data when possible, otherwise return the model tier for the question"""
+        tier, facts = self._triage(question, card)
+        if tier == 'extract':
+            answer = self._answer_from_card(question, facts, card)
+            if answer is not None:
+                return answer, tier
+            
+            # Cards missing the requested facts fall through to the cheap model
+            tier = 'cheap'
+        
+        return None, tier
+    
+    def _followup_model(self, tier: str) -> "ChatCohere":
+        """Chat model for a triaged follow-up, created on first use"""
+        return self.llm if tier == 'full' else self.llm_cheap
+    
+    @staticmethod
+    def _name_words(card: Dict) -> frozenset:
+        """Lower-cased words of a card's name and issuer"""
+        return frozenset(re.findall(r'[a-z0-9]+', f"{card.get('name', '')} {card.get('Institution', '')}".lower()))
+    
+    @cached_property
+    def _distinctive_name_words(self) -> frozenset:
+        """Issuer words and card name words rare enough in the catalog to identify a card"""
+        issuers = Counter()
+        names = Counter()
+        for card in self.cards:
+            issuers.update(set(re.findall(r'[a-z0-9]+', card['Institution'].lower())))
+            names.update(set(re.findall(r'[a-z0-9]+', card['name'].lower())))
+        rare = {word for word, count in names.items() if count <= DISTINCTIVE_NAME_CARDS}
+        return frozenset((issuers.keys() | rare) - _EXTRACTIVE_WORDS - _GENERIC_NAME_WORDS)
+    
+    @cached_property
+    def _fee_type_words(self) -> frozenset:
+        """Words naming a particular fee anywhere in the catalog (e.g. 'late', 'forex')"""
+        words = set()
+        for card in self.cards:
+            fee_data = card.get('fee_breakdown', [])
+            if isinstance(fee_data, dict):
+                fee_data = fee_data.get('fee_breakdown', [])
+            for fee in fee_data if isinstance(fee_data, list) else []:
+                if isinstance(fee, dict) and fee.get('type'):
+                    words.update(fee['type'].lower().split('_'))
+        return frozenset(words - _GENERIC_FEE_WORDS)
+    
+    def _answer_from_card(self, question: str, facts: List[str], card: Dict) -> Optional[str]:
+        """Answer factual questions straight from the card JSON, or None if a fact is missing"""
+        lines = [f"{card.get('name')}:"]
+        for fact in facts:
+            if fact == 'fees':
+                fee_data = card.get('fee_breakdown', [])
+                if isinstance(fee_data, dict):
+                    fee_info = fee_data.get('fee_breakdown', [])
+                else:
+                    fee_info = fee_data if isinstance(fee_data, list) else []
+                fees = [fee for fee in fee_info if isinstance(fee, dict) and fee.get('type') and fee.get('details')]
+                
+                # Fees whose type words best match the question (e.g. 'late payment'),
+                # otherwise joining and annual fees
+                fee_pattern = dict(_EXTRACTIVE_RES)['fees']
+                fee_question = ' '.join(part for part in _JOINED_PARTS_RE.split(question) if fee_pattern.search(part))
+                question_words = set(re.findall(r'[a-z]+', fee_question.lower())) - _GENERIC_FEE_WORDS
+                scores = [len(question_words.intersection(fee['type'].lower().split('_'))) for fee in fees]
+                best = max(scores, default=0)
+                if best:
+                    asked = [fee for fee, score in zip(fees, scores) if score == best]
+                elif question_words & self._fee_type_words:
+                    return None  # names a fee this card does not list
+                else:
+                    asked = [fee for fee in fees if fee['type'] in ('joining_fee', 'annual_fee')]
+                if not asked:
+                    return None
+                for fee in asked:
+                    lines.append(f"{fee['type'].replace('_', ' ').capitalize()}: {' '.join(fee['details'])}")
+            
+            elif fact == 'eligibility':
+                income_req = card.get('eligibility_income_min') or {}
+                labels = (('salaried', 'salaried'), ('self_employed', 'self-employed'), ('Any', 'any employment'))
+                incomes = [f"₹{income_req[key]:,} ({label})" for key, label in labels if income_req.get(key)]
+                if not incomes:
+                    return None
+                lines.append(f"Minimum income: {', '.join(incomes)}")
+                if card.get('minimum_credit_score'):
+                    lines.append(f"Minimum credit score: {card['minimum_credit_score']}")
+            
+            elif fact == 'issuer':
+                requirement = "requires" if card.get('is_bank_customer_only') else "does not require"
+                lines.append(f"Issued by {card.get('Institution')}; {requirement} an existing account with the bank.")
+            
+            elif fact == 'interest':
+                if not card.get('interest_rate'):
+                    return None
+                lines.append(f"Interest rate: {card['interest_rate']}")
+        
+        return '\n'.join(lines)
+    
     def _extract_key_features(self, card: Dict) -> List[str]:
+        """Key features of a card for summary, precomputed at load time"""
+        cached = card.get('_cached_features')
+        return cached if cached is not None else self._compute_key_features(card)
+    
+    def _compute_key_features(self, card: Dict) -> List[str]:
         """Extract key features of a card for summary"""
         features = []
         
@@ -802,10 +1533,12 @@ Response:"""
         for reward in rewards:
             if isinstance(reward, dict):
                 reward_type = reward.get('type', '')
-                if reward_type and len(features) < 5:
+                if reward_type:
                     features.append(reward_type)
-            elif isinstance(reward, str) and len(features) < 5:
+            elif isinstance(reward, str):
                 features.append(reward[:50])  # Truncate long strings
+            if len(features) >= 5:
+                return features
         
         # Add fee info
         fee_data = card.get('fee_breakdown', [])
@@ -813,20 +1546,21 @@ Response:"""
             fee_breakdown = fee_data.get('fee_breakdown', [])
         else:
             fee_breakdown = fee_data if isinstance(fee_data, list) else []
-            
-        for fee in fee_breakdown:
-            if isinstance(fee, dict) and fee.get('type') == 'joining_fee':
-                details = ' '.join(fee.get('details', [])).lower()
-                if 'nil' in details or 'waived' in details:
-                    features.append('No joining fee')
-                    break
+        
+        joining_details = (
+            ' '.join(fee.get('details', [])).lower()
+            for fee in fee_breakdown
+            if isinstance(fee, dict) and fee.get('type') == 'joining_fee'
+        )
+        if any(word in details for details in joining_details for word in WAIVE_WORDS):
+            features.append('No joining fee')
         
         # Add categories
         badges = card.get('badge', [])
         if badges:
-            features.extend(badges[:3])
+            features.extend(badges[:min(3, 5 - len(features))])
         
-        return features[:5]
+        return features
     
     def _extract_relevant_data(self, question: str, card: Dict) -> str:
         """Extract relevant card data based on the question"""
@@ -845,7 +1579,7 @@ Response:"""
         if 'eligib' in question_lower or 'income' in question_lower:
             relevant_data['eligibility'] = card.get('eligibility_income_min', {})
         
-        return json.dumps(relevant_data, indent=2)
+        return _jdumps(relevant_data)
     
 
     
@@ -857,10 +1591,12 @@ Response:"""
         current_card = self.session_state.get('current_card')
         
         # Prepare alternatives excluding current card and excluded institutions
+        current_name = (current_card or {}).get('name')
+        excluded = self.session_state['excluded_institutions']
         alternatives = []
         for card in recommended_cards:
-            if (card != current_card and 
-                card.get('Institution') not in self.session_state['excluded_institutions']):
+            if (card.get('name') != current_name and 
+                card.get('Institution') not in excluded):
                 alternatives.append({
                     'name': card.get('name'),
                     'institution': card.get('Institution'),
@@ -874,18 +1610,12 @@ Response:"""
             return None
         
         # Use CARD_SELECTION_PROMPT for better alternative selection
-        prompt = PromptTemplate(
-            input_variables=["user_prefs", "cards_data", "excluded_banks"],
-            template=CARD_SELECTION_PROMPT
-        )
-        
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        
         try:
-            response = chain.run(
-                user_prefs=json.dumps(self.user_prefs, indent=2),
-                cards_data=json.dumps(alternatives[:5], indent=2),
-                excluded_banks=json.dumps(self.session_state['excluded_institutions'])
+            response = self._invoke(
+                self._prompts.CARD_SELECTION_TMPL,
+                user_prefs=self._prefs_json(),
+                cards_data=_jdumps([{**alt, 'full_data': self._public_card(alt['full_data'])} for alt in alternatives[:5]]),
+                excluded_banks=_jdumps(sorted(self.session_state['excluded_institutions']))
             )
             
             # Extract recommended alternative
@@ -913,7 +1643,7 @@ Response:"""
             
             if selected_card:
                 self.session_state['current_card'] = selected_card
-                self.session_state['excluded_institutions'].append(selected_card.get('Institution'))
+                self.session_state['excluded_institutions'].add(selected_card.get('Institution'))
                 
                 print("\n" + "="*50)
                 print("ALTERNATIVE RECOMMENDATION")
@@ -939,15 +1669,35 @@ Response:"""
     def conversational_interaction_loop(self, recommended_card):
         """LLM-powered conversational interaction with full context awareness"""
         print("\nI'm here to answer any questions about your recommended card or help you explore alternatives.")
-        print("Feel free to ask about features, fees, benefits, or request different cards. Type 'exit' to finish.\n")
+        print("Feel free to ask about features, fees, benefits, or request different cards. Type 'exit' to finish.")
+        print(f"Queue several questions with '/add <question>' and get them answered together with '/ask' (or automatically after {QUESTION_BATCH_SIZE}).\n")
         
         while True:
             user_input = input("You: ").strip()
             
             if user_input.lower() in ['exit', 'quit', 'bye', 'done']:
+                if self._pending_questions:
+                    self._answer_pending_questions(recommended_card)
                 self._conversational_goodbye()
                 break
             
+            if user_input.lower().startswith('/add '):
+                question = user_input[5:].strip()
+                if question:
+                    self._pending_questions.append(question)
+                    if len(self._pending_questions) >= QUESTION_BATCH_SIZE:
+                        self._answer_pending_questions(recommended_card)
+                    else:
+                        print(f"\nQueued ({len(self._pending_questions)}/{QUESTION_BATCH_SIZE}). Add more or type '/ask' for answers.\n")
+                continue
+            
+            if user_input.lower() == '/ask':
+                if self._pending_questions:
+                    self._answer_pending_questions(recommended_card)
+                else:
+                    print("\nNo questions queued. Use '/add <question>' to queue one.\n")
+                continue
+            
             if not user_input:
                 print("\nWhat would you like to know about your card or alternatives?")
                 continue
@@ -955,95 +1705,148 @@ Response:"""
             # Add to conversation history
             self.conversation_history.append(f"User: {user_input}")
             
-            # LLM handles everything from here
+            # LLM handles everything from here, printing its reply as it arrives
             response = self._llm_conversational_handler(user_input, recommended_card)
             
             # Add response to history
             if response:
                 self.conversation_history.append(f"Assistant: {response}")
-                print(f"\n{response}\n")
     
-    def _llm_conversational_handler(self, user_input: str, current_card: Dict) -> str:
-        """LLM handles conversations using ONLY JSON data and card links"""
-        self.session_state['llm_calls_count'] += 1
-        
+    def _answer_pending_questions(self, current_card: Dict):
+        """Answer all queued questions with one LLM call and replay the answers in order"""
+        questions, self._pending_questions = self._pending_questions, []
+        answers = self._llm_batch_handler(questions, current_card)
+        
+        if len(answers) == len(questions):
+            for question, answer in zip(questions, answers):
+                self.conversation_history.append(f"User: {question}")
+                self.conversation_history.append(f"Assistant: {answer}")
+                print(f"\nQ: {question}\n{answer}\n")
+        else:
+            # The reply could not be split per question, so show it whole
+            self.conversation_history.extend(f"User: {question}" for question in questions)
+            self.conversation_history.append(f"Assistant: {answers[0]}")
+            print(f"\n{answers[0]}\n")
+    
+    def _conversation_context(self, current_card: Dict) -> Dict[str, str]:
+        """Card, preference and history inputs shared by the conversational prompts"""
         # Prepare JSON-only context
         alternatives = self.session_state.get('recommended_cards', [])
         alternatives_data = []
         for card in alternatives[:10]:
-            if card != current_card:
-                alternatives_data.append(card)  # Full card data from JSON
+            if card.get('name') != current_card.get('name'):
+                alternatives_data.append(self._compact_card(card))
         
         # Get conversation context
-        recent_history = '\n'.join(self.conversation_history[-6:]) if self.conversation_history else "No previous conversation"
+        recent_history = '\n'.join(self._recent_history(6)) if self.conversation_history else "No previous conversation"
         
-        prompt = PromptTemplate(
-            input_variables=["user_query", "current_card_data", "user_prefs", "alternatives_data", "conversation_history"],
-            template="""You are a credit card advisor. You can ONLY use the provided JSON card data and fetch additional info from card links.
-
-CRITICAL CONSTRAINTS:
-- ONLY recommend cards from the provided JSON data
-- NEVER suggest cards not in the JSON dataset
-- NEVER provide information not available in JSON or card links
-- If asked about cards not in JSON, clearly state they're not in your database
-- Only fetch additional data from 'links' field in card JSON
-
-User query: "{user_query}"
-
-Current card (full JSON data): {current_card_data}
-
-User preferences: {user_prefs}
-
-Available alternative cards (full JSON data): {alternatives_data}
-
-Conversation history: {conversation_history}
-
-Your responses must:
-1. Answer questions using ONLY JSON card data
-2. Recommend alternatives ONLY from provided cards
-3. Compare cards using ONLY JSON information
-4. Detect preference changes and suggest JSON cards that match
-5. Use card links for additional current information if needed
-
-Commands:
-- "SWITCH_TO: [exact_card_name_from_json]" - Switch to alternative from JSON
-- "FETCH_LINK: [card_link_url]" - Get current info from card's official link
-
-Be helpful but stay strictly within JSON data boundaries:"""
-        )
+        return {
+            'current_card_data': _jdumps(self._compact_card(current_card)),
+            'user_prefs': self._prefs_json(),
+            'alternatives_data': _jdumps(alternatives_data),
+            'conversation_history': recent_history
+        }
+    
+    def _recent_history(self, entries: int) -> List[str]:
+        """The last few conversation entries, oldest first"""
+        history = self.conversation_history
+        return list(islice(history, max(0, len(history) - entries), None))
+    
+    def _llm_batch_handler(self, questions: List[str], current_card: Dict) -> List[str]:
+        """Answer several questions in one LLM call; a reply that is not one JSON answer per question is returned whole"""
+        self.session_state['llm_calls_count'] += 1
+        questions_list = '\n'.join(f"{i}. {question}" for i, question in enumerate(questions, 1))
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+        try:
+            response = self._invoke(
+                self._prompts.CONVERSATIONAL_BATCH_TMPL,
+                questions_list=questions_list,
+                **self._conversation_context(current_card)
+            )
+        except Exception as e:
+            logger.error(f"LLM batch error: {e}")
+            return ["I'm having trouble processing those questions. Could you ask them one at a time?"]
         
+        # Tolerate prose or code fences around the array
+        start, end = response.find('['), response.rfind(']')
         try:
-            response = chain.run(
+            answers = orjson.loads(response[start:end + 1]) if start != -1 and end > start else None
+        except orjson.JSONDecodeError:
+            answers = None
+        
+        if not isinstance(answers, list) or len(answers) != len(questions):
+            logger.warning("Batch reply was not a JSON array with one answer per question")
+            answers = [response]
+        
+        return [self._apply_llm_commands(str(answer).strip(), current_card) for answer in answers]
+    
+    def _llm_conversational_handler(self, user_input: str, current_card: Dict) -> str:
+        """LLM handles conversations using ONLY JSON data and card links, printing the reply as it streams"""
+        direct_answer, tier = self._triage_followup(user_input, current_card)
+        if direct_answer is not None:
+            print(f"\n{direct_answer}\n")
+            return direct_answer
+        
+        streamed = False
+        
+        def generate() -> str:
+            nonlocal streamed
+            streamed = True
+            return self._print_stream(self._stream(
+                self._prompts.CONVERSATIONAL_HANDLER_TMPL,
+                llm=self._followup_model(tier),
                 user_query=user_input,
-                current_card_data=json.dumps(current_card, indent=2),
-                user_prefs=json.dumps(self.user_prefs, indent=2),
-                alternatives_data=json.dumps(alternatives_data, indent=2),
-                conversation_history=recent_history
-            )
-            
-            # Handle LLM commands
-            if "SWITCH_TO:" in response:
-                card_name = response.split("SWITCH_TO:")[1].split("\n")[0].strip()
-                new_card = self._switch_to_alternative(card_name)
-                if new_card:
-                    self.session_state['current_card'] = new_card
-                    response = response.replace(f"SWITCH_TO: {card_name}", "").strip()
-                    response += f"\n\n[Switched to {new_card.get('name')}]"
-            
-            elif "FETCH_LINK:" in response:
-                link_url = response.split("FETCH_LINK:")[1].split("\n")[0].strip()
-                link_content = self._fetch_card_link_content(link_url, current_card)
-                if link_content:
-                    response = response.replace(f"FETCH_LINK: {link_url}", "").strip()
-                    response += f"\n\nCurrent information from official source: {link_content[:500]}..."
+                **self._conversation_context(current_card)
+            ))
+        
+        try:
+            print()
+            # Commands in the response are cached raw so they still run on a repeat
+            response = self._cached_followup('conversation', user_input, current_card, generate)
+            if not streamed:
+                self._print_stream([response])
             
-            return response
+            remainder, notice = self._run_llm_command(response, current_card)
+            print(f"{notice}\n")
+            return remainder + notice
             
         except Exception as e:
             logger.error(f"LLM conversational error: {e}")
-            return "I'm having trouble processing that. Could you rephrase your question or ask about specific card features?"
+            fallback = "I'm having trouble processing that. Could you rephrase your question or ask about specific card features?"
+            print(f"\n{fallback}\n")
+            return fallback
+    
+    def _apply_llm_commands(self, response: str, current_card: Dict) -> str:
+        """Carry out a SWITCH_TO or FETCH_LINK command in an LLM response"""
+        remainder, notice = self._run_llm_command(response, current_card)
+        return remainder + notice if notice else response
+    
+    def _run_llm_command(self, response: str, current_card: Dict) -> Tuple[str, str]:
+        """Carry out a command in an LLM response, returning the response without it and a note on the outcome"""
+        # First occurrence of each command, found in one scan; SWITCH_TO takes precedence
+        commands = {}
+        for match in _CMD_RE.finditer(response):
+            commands.setdefault(match.group(1), match)
+        
+        match = commands.get('SWITCH_TO') or commands.get('FETCH_LINK')
+        if match is None:
+            return response, ""
+        
+        command, argument = match.group(1), match.group(2).strip()
+        remainder = (response[:match.start()] + response[match.end():]).strip()
+        
+        if command == 'SWITCH_TO':
+            new_card = self._switch_to_alternative(argument)
+            if new_card:
+                self.session_state['current_card'] = new_card
+                return remainder, f"\n\n[Switched to {new_card.get('name')}]"
+        
+        else:
+            link_content = self._fetch_card_link_content(argument, current_card)
+            if link_content:
+                return remainder, f"\n\nCurrent information from official source: {link_content[:500]}..."
+        
+        return remainder, ""
     
     def _switch_to_alternative(self, alt_name: str) -> Optional[Dict]:
         """Switch to suggested alternative card"""
@@ -1077,36 +1880,18 @@ Be helpful but stay strictly within JSON data boundaries:"""
         self.session_state['llm_calls_count'] += 1
         
         # Prepare conversation summary
-        conversation_summary = '\n'.join(self.conversation_history[-4:]) if self.conversation_history else "Brief interaction"
-        
-        prompt = PromptTemplate(
-            input_variables=["recommended_card", "conversation_summary", "user_prefs"],
-            template="""Create a personalized goodbye message based on the conversation.
-
-Final recommended card: {recommended_card}
-User preferences: {user_prefs}
-Conversation highlights: {conversation_summary}
-
-Make it:
-1. Personalized based on their preferences and conversation
-2. Encouraging about their final choice
-3. Include a relevant tip based on their card/preferences
-4. Warm but professional
-5. Brief (2-3 sentences max)
-
-Be natural and helpful."""
-        )
-        
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+        conversation_summary = '\n'.join(self._recent_history(4)) if self.conversation_history else "Brief interaction"
         
         try:
             current_card = self.session_state.get('current_card', {})
-            goodbye = chain.run(
+            print()
+            self._print_stream(self._stream(
+                self._prompts.GOODBYE_TMPL,
                 recommended_card=current_card.get('name', 'your chosen card'),
                 conversation_summary=conversation_summary,
-                user_prefs=json.dumps(self.user_prefs, indent=2)
-            )
-            print(f"\n{goodbye}\n")
+                user_prefs=self._prefs_json()
+            ))
+            print("\n")
         except:
             print("\nGreat choice! Use your new credit card responsibly and enjoy the benefits. Have a wonderful day!\n")
     